@@ -5,8 +5,14 @@ import random
 import subprocess
 import tempfile
 import shutil
+import stat
 import hashlib
+import functools
+import time
+import threading
+import queue
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import customtkinter as ctk
@@ -24,11 +30,44 @@ except Exception:
     cairosvg = None
     _HAS_CAIROSVG = False
 
+# pyvips (libvips → librsvg) is preferred when present: a C SVG parser, much faster than CairoSVG
+try:
+    import pyvips
+    _HAS_PYVIPS = True
+except Exception:
+    pyvips = None
+    _HAS_PYVIPS = False
+
+# orjson is optional; same 2-space layout as json.dumps(indent=2), several times faster
+try:
+    import orjson
+
+    def _dumps_pretty(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+except ImportError:
+    orjson = None
+
+    def _dumps_pretty(obj) -> str:
+        return json.dumps(obj, indent=2)
+
+# xxhash is optional; only used for cache file names, so a 64-bit BLAKE2b is an equivalent fallback
+try:
+    from xxhash import xxh3_64_hexdigest as _fast_hash
+except ImportError:
+    def _fast_hash(data: bytes) -> str:
+        # Same 16 hex chars as xxh3_64, no truncation needed
+        return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+# rsvg-convert CLI is the last-resort fallback (one process spawn per icon)
+_RSVG_CONVERT = shutil.which("rsvg-convert")
+
 
 APP_TITLE = " MP3 Player by Zunochikirin"
-SUPPORTED_EXT = {".mp3", ".ogg", ".wav", ".flac", ".m4a"}
+SUPPORTED_EXT = frozenset({".mp3", ".ogg", ".wav", ".flac", ".m4a"})
+_SUPPORTED_ENDS = tuple(SUPPORTED_EXT) + tuple(e.upper() for e in SUPPORTED_EXT)
 PLAYLISTS_FILE = "playlists.json"
 WINDOW_STATE_FILE = "window.json"
+DURATIONS_FILE = "durations.json"
 
 # ---------- Layout constants ----------
 BTN_W = 56
@@ -41,15 +80,66 @@ ICON_LIST_PX = 18
 ICON_NOW_PX  = 20
 ICON_VOL_PX  = 18
 
+# icon key -> (svg file in icons/, size in px)
+ICON_SPECS: dict[str, tuple[str, int]] = {
+    # Header / footer
+    "add":        ("plus.svg",          ICON_BTN_PX),
+    "folder":     ("add-folder.svg",    ICON_BTN_PX),
+    "clear":      ("close.svg",         ICON_BTN_PX),
+    "play":       ("start.svg",         ICON_BTN_PX),
+    "pause":      ("pause-button.svg",  ICON_BTN_PX),
+    "prev":       ("back.svg",          ICON_BTN_PX),
+    "next":       ("next.svg",          ICON_BTN_PX),
+    # Other
+    "music_tune": ("music-tune.svg",    ICON_LIST_PX),
+    "music_sign": ("music-sign.svg",    ICON_NOW_PX),
+    "volume":     ("medium-volume.svg", ICON_VOL_PX),
+}
+
+# Posted by pygame.mixer.music when a track finishes
+MUSIC_END_EVENT = pygame.USEREVENT + 1
+
 
 # ---------- Logging helper ----------
 def log(msg: str):
     print(f"[MP3Player] {msg}")
 
 
+# Read once at import (still single-threaded): os.umask can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _write_text_atomic(path: str, text: str):
+    """Write text to path via a temp file + os.replace, so readers never see a partial file."""
+    # Unique temp name: saves may run on worker threads concurrently with Tk-thread saves
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        # mkstemp creates 0600: keep the existing file's mode, else the usual umask default
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+@functools.cache
+def _find_ffmpeg() -> str | None:
+    # PATH scan done once per process
+    return shutil.which("ffmpeg")
+
+
 # ---------- Theme / color helpers ----------
-def theme_ink() -> str:
-    return "#111111" if ctk.get_appearance_mode().lower() == "light" else "#ffffff"
+# Icon ink per appearance mode (icons for both modes are rasterized up front)
+THEME_INK = {"light": "#111111", "dark": "#ffffff"}
 
 def accent_color() -> tuple[str, str]:
     return ("#6C63FF", "#8C52FF")
@@ -73,98 +163,276 @@ def fmt_time(sec: float | None) -> str:
     s = int(sec) % 60
     return f"{m:02d}:{s:02d}"
 
-def _natural_key(p: Path):
-    return [int(t) if t.isdigit() else t.lower() for t in re.split(r'(\d+)', p.stem)]
+_RE_NATSPLIT = re.compile(r'(\d+)')
+_NATURAL_KEY_CACHE: dict[str, list] = {}
 
+# Compiled key (natkey.pyx) when built; pure-Python otherwise
+try:
+    from natkey import natural_key as _natural_key_impl
+except ImportError:
+    def _natural_key_impl(stem: str) -> list:
+        return [int(t) if t.isdigit() else t.lower() for t in _RE_NATSPLIT.split(stem)]
+
+def _natural_key(p: Path):
+    stem = p.stem
+    k = _NATURAL_KEY_CACHE.get(stem)
+    if k is None:
+        k = _natural_key_impl(stem)
+        _NATURAL_KEY_CACHE[stem] = k
+    return k
+
+def _has_supported_ext(name: str) -> bool:
+    """Suffix check on the raw string: no PurePath, exact-case hit needs no allocation."""
+    return name.endswith(_SUPPORTED_ENDS) or name[-5:].lower().endswith(_SUPPORTED_ENDS)
+
+def _iter_audio(folder: str):
+    """Recursively yield audio file paths (str) under folder using os.scandir."""
+    stack = [folder]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    if _has_supported_ext(entry.name) and entry.is_file():
+                        yield entry.path
+                except OSError:
+                    continue
+
+@functools.lru_cache(maxsize=256)
 def shade_hex(col: str, factor: float) -> str:
     """Lighten/darken a #rrggbb by factor (>1 lighter, <1 darker)."""
     c = col.lstrip("#")
     if len(c) == 3:
         c = "".join(ch * 2 for ch in c)
-    r = max(0, min(255, int(int(c[0:2], 16) * factor)))
-    g = max(0, min(255, int(int(c[2:4], 16) * factor)))
-    b = max(0, min(255, int(int(c[4:6], 16) * factor)))
-    return f"#{r:02x}{g:02x}{b:02x}"
+    v = int(c[:6].ljust(6, "0"), 16)
+    r = max(0, min(255, int((v >> 16 & 0xff) * factor)))
+    g = max(0, min(255, int((v >> 8 & 0xff) * factor)))
+    b = max(0, min(255, int((v & 0xff) * factor)))
+    return f"#{(r << 16) | (g << 8) | b:06x}"
+
+@functools.lru_cache(maxsize=64)
+def _shade(color: tuple[str, str] | str, f: float) -> tuple[str, str] | str:
+    """shade_hex over a CTk color (single or (light, dark)); named colors pass through."""
+    def _one(col):
+        try:
+            return shade_hex(col, f)
+        except ValueError:
+            return col.lstrip("#")
+    if isinstance(color, tuple):
+        light, dark = color
+        return (_one(light), _one(dark))
+    return _one(color)
 
 
 # ---------- SVG → CTkImage (tint + rasterize) ----------
+# Rasterized icons, keyed by (path, mtime_ns, color, size_px)
+_SVG_CACHE: dict[tuple, "ctk.CTkImage"] = {}
+# PNG bytes, content-addressed by (digest of tinted svg, size_px) so identical tints share the cairo work
+_PNG_CACHE: dict[tuple, bytes] = {}
+# PNG bytes, indexed by (digest of source svg, color, size_px) so a hit skips the tint step too
+_PNG_BY_SOURCE: dict[tuple, bytes] = {}
+
+def _content_digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+# Rasterized PNGs persisted across runs, named by sha1(version | svg text | color | size).
+# Bump the version whenever _tint_svg_text or the rasterizers change their output.
+_ICON_CACHE_VERSION = 1
+
+@functools.cache
+def _icon_cache_dir() -> Path | None:
+    """Per-user icon cache dir (0700, owner checked), or None if it can't be trusted."""
+    if os.name == "nt":
+        base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    d = base / "mp3player" / "icons"
+    try:
+        d.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if os.name != "nt":
+            # Never decode PNGs someone else could have planted
+            st = os.lstat(d)
+            if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+                log(f"⚠️ Ignoring icon cache {d}: not a private directory")
+                return None
+    except OSError as e:
+        log(f"⚠️ Icon cache unavailable: {e}")
+        return None
+    return d
+
+def _read_icon_cache(key: str) -> bytes | None:
+    d = _icon_cache_dir()
+    if d is None:
+        return None
+    try:
+        return (d / f"{key}.png").read_bytes()
+    except OSError:
+        return None
+
+def _write_icon_cache(key: str, png_bytes: bytes):
+    d = _icon_cache_dir()
+    if d is None:
+        return
+    # Icons load from several threads: unique temp name, then atomic rename
+    try:
+        fd, tmp = tempfile.mkstemp(dir=d, suffix=".tmp")
+    except OSError as e:
+        log(f"⚠️ Cannot write icon cache {key}: {e}")
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(png_bytes)
+        os.replace(tmp, d / f"{key}.png")
+    except OSError as e:
+        log(f"⚠️ Cannot write icon cache {key}: {e}")
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+_RE_STYLE_ATTR   = re.compile(r'\bstyle\s*=', re.I)
+_RE_SVG_STYLE    = re.compile(r'(<svg[^>]*\bstyle\s*=\s*["\'])', re.I)
+_RE_SVG_TAG      = re.compile(r'<svg\b', re.I)
+# One pass over the document: fill/stroke attributes | style="..." | <style>...</style>
+_RE_TINT_FUSED   = re.compile(r'(fill|stroke)\s*=\s*([\'"])(?!none)[^\'"]+\2'
+                              r'|style\s*=\s*"(.*?)"'
+                              r'|<style[^>]*>(.*?)</style>', re.I | re.S)
+# One pass over a CSS fragment: fill (unless none) | stroke
+_RE_CSS_FUSED    = re.compile(r'(fill)\s*:\s*(?!none)[#\w().,%-]+|(stroke)\s*:\s*[#\w().,%-]+', re.I)
+_RE_PAINT_ANY    = re.compile(r'(?:fill|stroke)\s*=', re.I)
+_RE_WIDTH_ANY    = re.compile(r'\bwidth\s*=', re.I)
+_RE_HEIGHT_ANY   = re.compile(r'\bheight\s*=', re.I)
+_RE_SIZE_ATTR    = re.compile(r'(width|height)\s*=\s*([\'"])[^\'"]+\2', re.I)
+
+
+@functools.lru_cache(maxsize=128)
 def _tint_svg_text(svg: str, color: str, size_px: int | None) -> str:
     if "<svg" in svg:
-        if re.search(r'\bstyle\s*=', svg, re.I):
-            svg = re.sub(r'(<svg[^>]*\bstyle\s*=\s*["\'])', r'\1color:' + color + ';', svg, count=1, flags=re.I)
+        if _RE_STYLE_ATTR.search(svg):
+            svg = _RE_SVG_STYLE.sub(lambda m: f"{m.group(1)}color:{color};", svg, count=1)
         else:
-            svg = re.sub(r'<svg\b', f'<svg style="color:{color}"', svg, count=1, flags=re.I)
-
-    svg = re.sub(r'fill\s*=\s*([\'"])(?!none)[^\'"]+\1', f'fill="{color}"', svg, flags=re.I)
-    svg = re.sub(r'stroke\s*=\s*([\'"])(?!none)[^\'"]+\1', f'stroke="{color}"', svg, flags=re.I)
-
-    def _style_replacer(m):
-        style = m.group(1)
-        style = re.sub(r'fill\s*:\s*(?!none)[#\w().,%-]+', f'fill:{color}', style, flags=re.I)
-        style = re.sub(r'stroke\s*:\s*[#\w().,%-]+',      f'stroke:{color}', style, flags=re.I)
-        return f'style="{style}"'
-    svg = re.sub(r'style\s*=\s*"(.*?)"', _style_replacer, svg, flags=re.I | re.S)
-
-    def _css_replacer(m):
-        css = m.group(1)
-        css = re.sub(r'fill\s*:\s*(?!none)[#\w().,%-]+',  f'fill:{color}', css, flags=re.I)
-        css = re.sub(r'stroke\s*:\s*[#\w().,%-]+',        f'stroke:{color}', css, flags=re.I)
+            svg = _RE_SVG_TAG.sub(f'<svg style="color:{color}"', svg, count=1)
+
+    def _css(css: str) -> str:
+        return _RE_CSS_FUSED.sub(lambda m: f"{'fill' if m.group(1) else 'stroke'}:{color}", css)
+
+    def _tint(m):
+        if m.group(1):
+            return f'{m.group(1).lower()}="{color}"'
+        if m.group(3) is not None:
+            return f'style="{_css(m.group(3))}"'
+        css = _css(m.group(4))
         if "color:" not in css.lower():
             css = f"svg{{color:{color};}}\n" + css
         return f"<style>{css}</style>"
-    svg = re.sub(r'<style[^>]*>(.*?)</style>', _css_replacer, svg, flags=re.I | re.S)
+    # Substring probes are C memmem scans; skip the regex pass when there is nothing to retint
+    low = svg.lower()
+    if "fill" in low or "stroke" in low or "<style" in low:
+        svg = _RE_TINT_FUSED.sub(_tint, svg)
 
-    if not re.search(r'fill\s*=', svg, re.I) and not re.search(r'stroke\s*=', svg, re.I):
-        svg = re.sub(r"<svg\b", f'<svg fill="{color}"', svg, count=1, flags=re.I)
+    if not _RE_PAINT_ANY.search(svg):
+        svg = _RE_SVG_TAG.sub(f'<svg fill="{color}"', svg, count=1)
 
     if size_px is not None:
-        if re.search(r'\bwidth\s*=', svg, re.I):
-            svg = re.sub(r'width\s*=\s*([\'"])[^\'"]+\1', f'width="{size_px}"', svg, flags=re.I)
-        else:
-            svg = re.sub(r'<svg\b', f'<svg width="{size_px}"', svg, count=1, flags=re.I)
-        if re.search(r'\bheight\s*=', svg, re.I):
-            svg = re.sub(r'height\s*=\s*([\'"])[^\'"]+\1', f'height="{size_px}"', svg, flags=re.I)
-        else:
-            svg = re.sub(r'<svg\b', f'<svg height="{size_px}"', svg, count=1, flags=re.I)
+        has_w = _RE_WIDTH_ANY.search(svg) is not None
+        has_h = _RE_HEIGHT_ANY.search(svg) is not None
+        svg = _RE_SIZE_ATTR.sub(lambda m: f'{m.group(1)}="{size_px}"', svg)
+        missing = ("" if has_h else f' height="{size_px}"') + ("" if has_w else f' width="{size_px}"')
+        if missing:
+            svg = _RE_SVG_TAG.sub(f"<svg{missing}", svg, count=1)
     return svg
 
 def _safe_read_text(path: Path) -> str | None:
+    # One read; pick the codec from the BOM instead of retrying on decode errors
     try:
-        return path.read_text(encoding="utf-8")
-    except UnicodeDecodeError:
-        try:
-            return path.read_text(encoding="utf-16")
-        except Exception:
-            try:
-                return path.read_bytes().decode("utf-8", errors="ignore")
-            except Exception as e:
-                log(f"⚠️ Cannot decode SVG {path}: {e}")
-                return None
-    except Exception as e:
+        data = path.read_bytes()
+    except OSError as e:
         log(f"⚠️ Cannot read SVG {path}: {e}")
         return None
+    if data[:2] in (b"\xff\xfe", b"\xfe\xff"):
+        try:
+            return data.decode("utf-16")
+        except UnicodeDecodeError as e:
+            log(f"⚠️ Cannot decode SVG {path}: {e}")
+            return None
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("utf-8", errors="ignore")
+
+def _svg_to_png(svg_bytes: bytes, size_px: int | None) -> bytes:
+    """Rasterize SVG bytes to PNG with the fastest available backend."""
+    if _HAS_PYVIPS:
+        try:
+            # The tinted SVG already carries width/height = size_px
+            return pyvips.Image.svgload_buffer(svg_bytes).write_to_buffer(".png")
+        except Exception as e:
+            log(f"⚠️ pyvips rasterize failed, falling back: {e}")
+    if _HAS_CAIROSVG:
+        try:
+            return cairosvg.svg2png(
+                bytestring=svg_bytes,
+                output_width=size_px if size_px else None,
+                output_height=size_px if size_px else None
+            )
+        except Exception as e:
+            if not _RSVG_CONVERT:
+                raise
+            log(f"⚠️ CairoSVG rasterize failed, falling back: {e}")
+    if not _RSVG_CONVERT:
+        raise RuntimeError("no SVG rasterizer available")
+    # Last resort: a process spawn per icon costs more than in-process CairoSVG at these sizes
+    cmd = [_RSVG_CONVERT, "-f", "png"]
+    if size_px:
+        cmd += ["-w", str(size_px), "-h", str(size_px)]
+    return subprocess.run(cmd, input=svg_bytes, check=True,
+                          stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout
 
 def ctk_image_from_svg_file(path: Path, color: str, size_px: int | None) -> "ctk.CTkImage | None":
-    svg_text = _safe_read_text(path)
-    if not svg_text:
+    try:
+        key = (str(path), path.stat().st_mtime_ns, color, size_px)
+    except OSError as e:
+        log(f"⚠️ Cannot stat SVG {path}: {e}")
         return None
+    cached = _SVG_CACHE.get(key)
+    if cached is not None:
+        return cached
 
-    svg_tinted = _tint_svg_text(svg_text, color, size_px)
-
-    if not _HAS_CAIROSVG:
-        log(f"ℹ️ CairoSVG not available; skipping rasterization for {path.name}")
+    svg_text = _safe_read_text(path)
+    if not svg_text:
         return None
 
     try:
-        png_bytes = cairosvg.svg2png(
-            bytestring=svg_tinted.encode("utf-8"),
-            output_width=size_px if size_px else None,
-            output_height=size_px if size_px else None
-        )
+        src_key = (_content_digest(svg_text), color, size_px)
+        png_bytes = _PNG_BY_SOURCE.get(src_key)
+        if png_bytes is None:
+            disk_key = hashlib.sha1(
+                f"{_ICON_CACHE_VERSION}|{svg_text}|{color}|{size_px}".encode("utf-8")).hexdigest()
+            png_bytes = _read_icon_cache(disk_key)
+            if png_bytes is None:
+                if not (_HAS_PYVIPS or _HAS_CAIROSVG or _RSVG_CONVERT):
+                    log(f"ℹ️ No SVG rasterizer available; skipping rasterization for {path.name}")
+                    return None
+                svg_tinted = _tint_svg_text(svg_text, color, size_px)
+                png_key = (_content_digest(svg_tinted), size_px)
+                png_bytes = _PNG_CACHE.get(png_key)
+                if png_bytes is None:
+                    png_bytes = _svg_to_png(svg_tinted.encode("utf-8"), size_px)
+                    _PNG_CACHE[png_key] = png_bytes
+                _write_icon_cache(disk_key, png_bytes)
+            _PNG_BY_SOURCE[src_key] = png_bytes
         pil = Image.open(BytesIO(png_bytes)).convert("RGBA")
         if size_px:
             pil = pil.resize((size_px, size_px), Image.LANCZOS)
-        return ctk.CTkImage(light_image=pil, dark_image=pil, size=pil.size)
+        img = ctk.CTkImage(light_image=pil, dark_image=pil, size=pil.size)
+        _SVG_CACHE[key] = img
+        return img
     except Exception as e:
         log(f"⚠️ SVG rasterize failed for {path.name}: {e}")
         return None
@@ -179,7 +447,7 @@ class SvgButton(ctk.CTkFrame):
         super().__init__(master, corner_radius=corner_radius, fg_color=fg_color)
         self._command = command
         self._base_color = fg_color
-        self._hover_color = hover_color or self._shade(fg_color, 1.08)
+        self._hover_color = hover_color or _shade(fg_color, 1.08)
         self._img = image
 
         self.configure(width=width, height=height)
@@ -198,83 +466,141 @@ class SvgButton(ctk.CTkFrame):
     def _on_enter(self, _): self.configure(fg_color=self._hover_color)
     def _on_leave(self, _): self.configure(fg_color=self._base_color)
 
-    def _shade(self, color, f):
-        def _one(col):
-            col = col.lstrip("#")
-            if len(col) == 3: col = ''.join(ch*2 for ch in col)
-            try:
-                r = int(col[0:2], 16); g = int(col[2:4], 16); b = int(col[4:6], 16)
-            except Exception: return col
-            r = max(0, min(255, int(r*f))); g = max(0, min(255, int(g*f))); b = max(0, min(255, int(b*f)))
-            return f"#{r:02x}{g:02x}{b:02x}"
-        if isinstance(color, tuple):
-            light, dark = color
-            return (_one(light), _one(dark))
-        return _one(color)
-
 
 # ---------- Main Application ----------
 class MP3Player(ctk.CTk):
     def __init__(self):
         super().__init__()
+        # Resolved once; icon and asset loaders reuse these
+        try:
+            self._base_dir = Path(__file__).resolve().parent
+        except NameError:
+            self._base_dir = Path.cwd()
+        self._icon_dir = self._base_dir / "icons"
         self._set_app_icons()
         self.title(APP_TITLE)
         self.geometry("820x650")
         self.minsize(720, 540)
 
         # Restore previous window geometry
+        self._last_saved_geo: str | None = None
         try:
             wstate = json.loads(Path(WINDOW_STATE_FILE).read_text(encoding="utf-8"))
             geo = wstate.get("geo")
             if geo: self.geometry(geo)
+            self._last_saved_geo = geo
         except Exception:
             pass
 
-        pygame.mixer.init()
+        # Decided by _ensure_mixer on first play (needs SDL's video subsystem)
+        self._use_endevent = False
+
+        self._mm = pygame.mixer.music  # hoisted attribute lookup for the playback paths
+
+        # The mixer is opened lazily on first play (_ensure_mixer): an idle, initialized
+        # mixer keeps SDL's audio thread spinning on some Linux setups
 
         # Playback state
         self.playlist: list[Path] = []
+        self._playlist_index: set[str] = set()  # str(path) of every playlist entry
         self.current_index: int | None = None
-        self.paused = False
+        # Playback state as driven by user actions and the end event: STOPPED | PLAYING | PAUSED
+        self._play_state = "STOPPED"
         self.shuffle = False
-        self.user_stopped = False
+        self._scan_gen = 0  # bumped on clear/load to drop in-flight folder scans
+        self._play_gen = 0  # bumped on every play request to drop stale background transcodes
+        self._preparing_gen: int | None = None  # _play_gen of the transcode the UI is waiting on
+        self._transcode_pool: ThreadPoolExecutor | None = None
+        self._transcodes: dict = {}  # out WAV path -> (ffmpeg Popen, Future of its wait/publish)
 
         # Progress state
         self.track_duration_s: float | None = None
+        self._track_duration_text = "00:00"
+        self._track_duration_ms_inv = 0.0
+        self._indeterminate_set = False
+        self._last_cur_s = -1  # last whole second shown by the poll tick
         self.elapsed_base_ms: int = 0
-
-        # Persisted playlists
-        self.playlists: dict[str, list[str]] = self._load_playlists_file()
+        self._play_started_at: float = 0.0  # monotonic time of the last play/unpause
+
+        # Track durations persisted across sessions: {path: (mtime_ns, size, seconds)}
+        # Filled by _deferred_init, after the first paint
+        self._dur_cache: dict[str, tuple[int, int, float | None]] = {}
+        self._dur_flush_after: str | None = None
+        self._dur_dirty = False  # a duration was parsed (not just looked up) since the last write
+        self._dur_pool: ThreadPoolExecutor | None = None  # background duration reads
+        self._dur_jobs: list = []
+
+        # Persisted playlists (read by _deferred_init)
+        self.playlists: dict[str, list[str]] = {}
+        self._playlists_hash = self._playlists_fingerprint()  # what's on disk
+
+        # Debounced writes of window geometry / playlists
+        self._pending_geo: str | None = None
+        self._geo_save_after: str | None = None
+        self._pl_save_after: str | None = None
+        self._persist_thread: threading.Thread | None = None  # last off-thread save, for ordering
 
         # Temp WAV cache for FFmpeg M4A fallback
-        self._temp_files: list[Path] = []
+        self._temp_files: set[Path] = set()
 
         # Appearance defaults
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
+        # Current mode, lowercased; only _toggle_theme changes it
+        self._mode: str = "dark"
 
         # Icons and cached row icons
         self.icons: dict[str, ctk.CTkImage | None] = {}
+        # Both themes are rasterized once; toggling just swaps which set is active
+        self._icon_sets: dict[str, dict] = {}
         self.row_icon_default = None
         self.row_icon_accent = None
         self.shuffle_icon_default = None
         self.shuffle_icon_accent = None
 
         # Zebra colors
-        self._bg_even = None
-        self._bg_odd = None
+        self._update_row_colors()
 
         self._build_ui()
-        self._load_icons()
-        self._apply_static_icons()
-        self._apply_shuffle_icon()
-        self._poll_playback()
+        # JSON reads and icon rasterization wait until the window has painted
+        self.after(10, self._deferred_init)
+        self._poll_after: str | None = None
+        self._pump_after: str | None = None  # end-of-track check; runs only while PLAYING
+        self._ui_visible = True
+        # add="+": CTk binds <Configure> on the root itself to track its size/scaling
+        self.bind("<Unmap>", self._on_unmap, add="+")
+        self.bind("<Map>", self._on_map, add="+")
+        self.bind("<Configure>", self._on_resize, add="+")
         self.protocol("WM_DELETE_WINDOW", self.on_close)
 
+    def _ensure_mixer(self):
+        if pygame.mixer.get_init():
+            return
+        # End-of-track arrives through SDL's event queue, which needs the video subsystem
+        try:
+            pygame.display.init()
+            self._use_endevent = True
+        except Exception as e:
+            log(f"ℹ️ Music end event unavailable, polling get_busy(): {e}")
+            self._use_endevent = False
+        pygame.mixer.init()
+        self._mm.set_volume(self.volume_slider.get() / 100)
+        if self._use_endevent:
+            self._mm.set_endevent(MUSIC_END_EVENT)
+
+    def _deferred_init(self):
+        self.playlists = self._load_playlists_file()
+        self._playlists_hash = self._playlists_fingerprint()
+        if self.playlists:
+            self.playlist_combo.configure(values=sorted(self.playlists.keys()))
+        # Merge rather than replace: a track may already have been timed since startup
+        self._dur_cache = {**self._load_dur_cache(), **self._dur_cache}
+        self._load_icons()
+
     # ----- App & taskbar icons -----
     def _set_app_icons(self):
         import platform, ctypes
-        base_dir = Path(__file__).resolve().parent
+        base_dir = self._base_dir
         ico_path = base_dir / "assets" / "app.ico"
         png_path = base_dir / "assets" / "app.png"
 
@@ -340,6 +666,9 @@ class MP3Player(ctk.CTk):
         self.list_container = ctk.CTkScrollableFrame(self, corner_radius=12)
         self.list_container.pack(fill="both", expand=True, padx=16, pady=(8, 6))
         self.row_widgets: list[ctk.CTkFrame] = []
+        self._row_paths: list[Path | None] = []
+        self._selected_index: int | None = None
+        self._current_icon_row_index: int | None = None
 
         # Now-playing bar
         self.now_frame = ctk.CTkFrame(self, corner_radius=0, height=72, fg_color=accent_color())
@@ -356,9 +685,13 @@ class MP3Player(ctk.CTk):
         self.now_label.pack(side="left", padx=6, pady=6)
 
         self.time_label = ctk.CTkLabel(top_row, text="00:00 / 00:00", font=("Segoe UI", 12))
+        self._last_time_text = "00:00 / 00:00"
         self.time_label.pack(side="right", padx=12, pady=6)
 
         self.progress_var = ctk.DoubleVar(value=0)
+        self._last_progress_bucket = 0
+        self._pending_ui: dict = {}
+        self._flush_scheduled = False
         self.progress_bar = ctk.CTkProgressBar(self.now_frame, variable=self.progress_var,
                                                progress_color="#FFFFFF", height=6)
         self.progress_bar.pack(fill="x", padx=16, pady=(2, 10))
@@ -406,61 +739,64 @@ class MP3Player(ctk.CTk):
         self.volume_slider.set(80)
         self.volume_slider.pack(side="left")
 
-        pygame.mixer.music.set_volume(0.8)
-
     # ----- Icons -----
     def _load_icons(self):
-        ink = theme_ink()
-        try:
-            base_dir = Path(__file__).resolve().parent
-        except NameError:
-            base_dir = Path.cwd()
-        icon_dir = base_dir / "icons"
+        icon_dir = self._icon_dir
 
         if not icon_dir.exists():
             log(f"⚠️ Icons directory not found: {icon_dir}")
         else:
             log(f"Icons directory: {icon_dir}")
 
-        def load(name: str, px: int | None):
+        def load(name: str, px: int | None, color: str):
             p = icon_dir / name
             if not p.exists():
                 log(f"⚠️ Missing icon file: {name}")
                 return None
-            img = ctk_image_from_svg_file(p, ink, size_px=px)
+            img = ctk_image_from_svg_file(p, color, size_px=px)
             if img is None:
                 log(f"⚠️ Failed to create image for: {name}")
             return img
 
-        # Header / footer
-        self.icons["add"]    = load("plus.svg",          ICON_BTN_PX)
-        self.icons["folder"] = load("add-folder.svg",    ICON_BTN_PX)
-        self.icons["clear"]  = load("close.svg",         ICON_BTN_PX)
-        self.icons["play"]   = load("start.svg",         ICON_BTN_PX)
-        self.icons["pause"]  = load("pause-button.svg",  ICON_BTN_PX)
-        self.icons["prev"]   = load("back.svg",          ICON_BTN_PX)
-        self.icons["next"]   = load("next.svg",          ICON_BTN_PX)
-
-        # Other
-        self.icons["music_tune"] = load("music-tune.svg",   ICON_LIST_PX)
-        self.icons["music_sign"] = load("music-sign.svg",   ICON_NOW_PX)
-        self.icons["volume"]     = load("medium-volume.svg", ICON_VOL_PX)
-
-        # Cached row icons (default/accent)
-        mt_path = icon_dir / "music-tune.svg"
-        is_dark = ctk.get_appearance_mode().lower() == "dark"
-        accent = accent_color()[1] if is_dark else accent_color()[0]
-        self.row_icon_default = ctk_image_from_svg_file(mt_path, theme_ink(), size_px=ICON_LIST_PX)
-        self.row_icon_accent  = ctk_image_from_svg_file(mt_path, accent,      size_px=ICON_LIST_PX)
-
-        # Shuffle icons (default/accent)
-        shuf_path = icon_dir / "shuffle.svg"
-        self.shuffle_icon_default = ctk_image_from_svg_file(shuf_path, theme_ink(), size_px=ICON_BTN_PX)
-        self.shuffle_icon_accent  = ctk_image_from_svg_file(shuf_path, accent,      size_px=ICON_BTN_PX)
-
+        # (mode, ink, accent) for both appearance modes, so a theme toggle never rasterizes
+        variants = (("light", THEME_INK["light"], accent_color()[0]),
+                    ("dark",  THEME_INK["dark"],  accent_color()[1]))
+
+        # Icons are independent: read/tint/rasterize them in parallel (rasterizers release
+        # the GIL). Workers only build images; widgets are touched back on this thread.
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            pending = {}
+            for mode, ink, accent in variants:
+                pending[mode] = {
+                    "icons": {key: ex.submit(load, fname, px, ink) for key, (fname, px) in ICON_SPECS.items()},
+                    # Cached row icons and shuffle icons (default/accent)
+                    "row_default":  ex.submit(load, "music-tune.svg", ICON_LIST_PX, ink),
+                    "row_accent":   ex.submit(load, "music-tune.svg", ICON_LIST_PX, accent),
+                    "shuf_default": ex.submit(load, "shuffle.svg",    ICON_BTN_PX,  ink),
+                    "shuf_accent":  ex.submit(load, "shuffle.svg",    ICON_BTN_PX,  accent),
+                }
+
+        self._icon_sets = {
+            mode: {k: ({n: f.result() for n, f in v.items()} if k == "icons" else v.result())
+                   for k, v in futs.items()}
+            for mode, futs in pending.items()
+        }
+        self._use_icon_set()
+        # Row colors are already current: only the row icons need painting
+        for i in range(len(self.row_widgets)):
+            self._paint_row(i)
+
+    def _use_icon_set(self):
+        """Point the active icon attributes at the preloaded set for the current mode."""
+        icon_set = self._icon_sets.get(self._mode)
+        if not icon_set:
+            return
+        self.icons = icon_set["icons"]
+        self.row_icon_default = icon_set["row_default"]
+        self.row_icon_accent  = icon_set["row_accent"]
+        self.shuffle_icon_default = icon_set["shuf_default"]
+        self.shuffle_icon_accent  = icon_set["shuf_accent"]
         self._apply_static_icons()
-        self._refresh_playlist()
-        self._apply_shuffle_icon()
 
     def _apply_static_icons(self):
         if not self.icons:
@@ -476,7 +812,7 @@ class MP3Player(ctk.CTk):
         self._apply_shuffle_icon()
 
     def _apply_play_icon(self):
-        is_playing = (self.current_index is not None) and pygame.mixer.music.get_busy() and not self.paused
+        is_playing = self._play_state == "PLAYING"
         self.play_btn.set_image(self.icons.get("pause") if is_playing else self.icons.get("play"))
 
     def _apply_shuffle_icon(self):
@@ -486,12 +822,11 @@ class MP3Player(ctk.CTk):
 
     # ----- Theme toggle -----
     def _toggle_theme(self):
-        current = ctk.get_appearance_mode()
-        ctk.set_appearance_mode("light" if current == "Dark" else "dark")
-        self._load_icons()
-        self.now_frame.configure(fg_color=accent_color())
-        self._refresh_playlist()
-        self._apply_shuffle_icon()
+        self._mode = "light" if self._mode == "dark" else "dark"
+        # CTk re-resolves (light, dark) color tuples itself, e.g. now_frame's accent
+        ctk.set_appearance_mode(self._mode)
+        self._use_icon_set()  # pointer swap, no rasterization
+        self._restyle_playlist()
 
     # ----- Playlists persistence -----
     def _load_playlists_file(self) -> dict:
@@ -501,16 +836,65 @@ class MP3Player(ctk.CTk):
         try:
             data = json.loads(p.read_text(encoding="utf-8"))
             if isinstance(data, dict):
-                return data
+                # Hand-edited files: keep only name -> list of path strings
+                valid = {k: v for k, v in data.items()
+                         if isinstance(v, list) and all(isinstance(x, str) for x in v)}
+                if len(valid) != len(data):
+                    log(f"⚠️ Skipped {len(data) - len(valid)} malformed playlist(s) in {PLAYLISTS_FILE}")
+                return valid
         except Exception as e:
             log(f"⚠️ Cannot read {PLAYLISTS_FILE}: {e}")
         return {}
 
     def _save_playlists_file(self):
+        # Coalesce back-to-back saves (e.g. several add_folder calls) into one write
+        if self._pl_save_after is not None:
+            self.after_cancel(self._pl_save_after)
+        self._pl_save_after = self.after(500, self._flush_playlists_file)
+
+    def _playlists_fingerprint(self) -> int:
+        return hash(tuple(sorted((k, tuple(v)) for k, v in self.playlists.items())))
+
+    def _playlists_snapshot(self) -> tuple[str, int] | None:
+        """(serialized playlists, fingerprint) if they changed since the last save, else None."""
+        h = self._playlists_fingerprint()
+        if h == self._playlists_hash:
+            return None
+        return _dumps_pretty(self.playlists), h
+
+    def _mark_playlists_saved(self, h: int):
+        # Runs on the writer thread after a successful write; a plain attribute store, no Tk
+        self._playlists_hash = h
+
+    def _flush_playlists_file(self):
+        self._pl_save_after = None
+        snap = self._playlists_snapshot()
+        if snap is None:
+            return
+        text, h = snap
+        # Serialized here (Tk thread owns self.playlists); only the disk write moves off-thread.
+        # The fingerprint is recorded only once the write succeeded, so a failed save is retried.
+        self._start_persist([(PLAYLISTS_FILE, text, functools.partial(self._mark_playlists_saved, h))])
+
+    # ----- Window geometry persistence -----
+    def _on_resize(self, ev):
+        if ev.widget is not self:
+            return  # <Configure> on the toplevel also fires for every child widget
+        self._pending_geo = self.geometry()
+        if self._geo_save_after is not None:
+            self.after_cancel(self._geo_save_after)
+        self._geo_save_after = self.after(500, self._flush_geo)
+
+    def _flush_geo(self):
+        self._geo_save_after = None
+        geo = self._pending_geo or self.geometry()
+        if geo == self._last_saved_geo:
+            return
         try:
-            Path(PLAYLISTS_FILE).write_text(json.dumps(self.playlists, indent=2), encoding="utf-8")
+            _write_text_atomic(WINDOW_STATE_FILE, json.dumps({"geo": geo}))
+            self._last_saved_geo = geo
         except Exception as e:
-            log(f"⚠️ Cannot write {PLAYLISTS_FILE}: {e}")
+            log(f"⚠️ Cannot write {WINDOW_STATE_FILE}: {e}")
 
     def _unique_playlist_name(self, base: str) -> str:
         name = base
@@ -530,73 +914,120 @@ class MP3Player(ctk.CTk):
     def _load_playlist_paths(self, paths: list[str]):
         self._halt_playback()
         self.current_index = None
+        self._selected_index = None
+        self._scan_gen += 1
         self.playlist.clear()
         for p in paths:
+            if not _has_supported_ext(p):
+                continue
             pp = Path(p)
-            if pp.exists() and pp.suffix.lower() in SUPPORTED_EXT:
+            if pp.exists():
                 self.playlist.append(pp)
+        self._playlist_index.clear()
+        self._playlist_index.update(map(str, self.playlist))
         self.playlist.sort(key=_natural_key)
-        self._refresh_playlist()
+        self._update_playlist_incremental()
+        self._precompute_durations(self.playlist)
         if self.playlist:
-            self.now_label.configure(text=f"Loaded playlist: {display_name(Path(self.playlist[0]), 50)}")
+            self._apply_ui_state(now_text=f"Loaded playlist: {display_name(Path(self.playlist[0]), 50)}")
 
     # ----- Playlist UI -----
-    def _refresh_playlist(self):
-        for child in self.list_container.winfo_children():
-            child.destroy()
-        self.row_widgets = []
-
-        if ctk.get_appearance_mode().lower() == "dark":
+    def _update_row_colors(self):
+        if self._mode == "dark":
             self._bg_even = "#2d2d36"
             self._bg_odd  = "#34343f"
-            hover_factor = 1.06
+            self._bg_sel  = "#3b3b46"
+            self._hover_factor = 1.06
         else:
             light_dim, _ = dim_color()
             light_sep, _ = list_separator_color()
             self._bg_even = light_sep
             self._bg_odd  = light_dim
-            hover_factor = 0.97
+            self._bg_sel  = "#e6e6e6"
+            self._hover_factor = 0.97
+
+    def _restyle_playlist(self):
+        """Re-theme every existing row in place (colors + icons), then sync with the playlist."""
+        self._update_row_colors()
+        for idx, row in enumerate(self.row_widgets):
+            row._base_bg = self._bg_even if idx % 2 == 0 else self._bg_odd
+            row._hover_bg = shade_hex(row._base_bg, self._hover_factor)
+            row.configure(fg_color=self._bg_sel if row._is_selected else row._base_bg)
+        # The swapped icon set holds different image objects, so _paint_row sees the change
+        self._update_playlist_incremental()
+
+    def _update_playlist_incremental(self):
+        """Sync the row pool with self.playlist, only touching rows that changed."""
+        n = len(self.playlist)
+        for row in self.row_widgets[n:]:
+            row.destroy()
+        del self.row_widgets[n:]
+        del self._row_paths[n:]
 
         for idx, path in enumerate(self.playlist):
-            base_bg = self._bg_even if idx % 2 == 0 else self._bg_odd
-            hover_bg = shade_hex(base_bg, hover_factor)
-
-            row = ctk.CTkFrame(self.list_container, corner_radius=8, fg_color=base_bg)
-            row.pack(fill="x", padx=12, pady=(2, 0))
-            row._base_bg = base_bg
-            row._hover_bg = hover_bg
-            row._is_selected = False
-            self.row_widgets.append(row)
-
-            icon_img = self.row_icon_accent if idx == self.current_index else self.row_icon_default
-            icon = ctk.CTkLabel(row, image=icon_img, text="")
-            icon.pack(side="left", padx=(10, 8), pady=8)
-
-            lbl = ctk.CTkLabel(row, text=display_name(path, 80), anchor="w")
-            lbl.pack(side="left", fill="x", expand=True, padx=(0, 10), pady=8)
-
-            for w in (row, icon, lbl):
-                w.bind("<Button-1>", lambda e, i=idx: self._on_select(i))
-                w.bind("<Double-Button-1>", lambda e, i=idx: self._start_play(i))
-
-            def _enter(ev, r=row):
-                if not getattr(r, "_is_selected", False):
-                    r.configure(fg_color=r._hover_bg)
-            def _leave(ev, r=row):
-                if not getattr(r, "_is_selected", False):
-                    r.configure(fg_color=r._base_bg)
-            row.bind("<Enter>", _enter)
-            row.bind("<Leave>", _leave)
+            if idx >= len(self.row_widgets):
+                self.row_widgets.append(self._create_row(idx))
+                self._row_paths.append(None)
+            if self._row_paths[idx] != path:
+                self._row_paths[idx] = path
+                self.row_widgets[idx]._lbl.configure(text=display_name(path, 80))
+            self._paint_row(idx)
+
+    def _create_row(self, idx: int) -> ctk.CTkFrame:
+        base_bg = self._bg_even if idx % 2 == 0 else self._bg_odd
+
+        row = ctk.CTkFrame(self.list_container, corner_radius=8, fg_color=base_bg)
+        row.pack(fill="x", padx=12, pady=(2, 0))
+        row._base_bg = base_bg
+        row._hover_bg = shade_hex(base_bg, self._hover_factor)
+        row._is_selected = False
+        row._icon_img = self.row_icon_default
+
+        icon = ctk.CTkLabel(row, image=row._icon_img, text="")
+        icon.pack(side="left", padx=(10, 8), pady=8)
+        row._icon_lbl = icon
+
+        lbl = ctk.CTkLabel(row, text="", anchor="w")
+        lbl.pack(side="left", fill="x", expand=True, padx=(0, 10), pady=8)
+        row._lbl = lbl
+
+        # Rows are only appended/truncated at the tail, so a row's index never changes
+        for w in (row, icon, lbl):
+            w.bind("<Button-1>", lambda e, i=idx: self._on_select(i))
+            w.bind("<Double-Button-1>", lambda e, i=idx: self._start_play(i))
+
+        def _enter(ev, r=row):
+            if not getattr(r, "_is_selected", False):
+                r.configure(fg_color=r._hover_bg)
+        def _leave(ev, r=row):
+            if not getattr(r, "_is_selected", False):
+                r.configure(fg_color=r._base_bg)
+        row.bind("<Enter>", _enter)
+        row.bind("<Leave>", _leave)
+        return row
+
+    def _paint_row(self, idx: int):
+        """Apply current-track icon and selection color to one row, if they changed."""
+        row = self.row_widgets[idx]
+        icon_img = self.row_icon_accent if idx == self.current_index else self.row_icon_default
+        if row._icon_img is not icon_img:
+            row._icon_img = icon_img
+            row._icon_lbl.configure(image=icon_img)
+        selected = idx == self._selected_index
+        if row._is_selected != selected:
+            row._is_selected = selected
+            row.configure(fg_color=self._bg_sel if selected else row._base_bg)
+
+    def _update_current_row_highlight(self, old_idx: int | None, new_idx: int | None):
+        """Repaint only the rows whose icon/selection can have changed."""
+        for i in (old_idx, new_idx):
+            if i is not None and i < len(self.row_widgets):
+                self._paint_row(i)
 
     def _on_select(self, index: int):
-        sel = "#3b3b46" if ctk.get_appearance_mode().lower() == "dark" else "#e6e6e6"
-        for i, row in enumerate(self.row_widgets):
-            if i == index:
-                row._is_selected = True
-                row.configure(fg_color=sel)
-            else:
-                row._is_selected = False
-                row.configure(fg_color=row._base_bg)
+        prev = self._selected_index
+        self._selected_index = index
+        self._update_current_row_highlight(prev, index)
 
     # ----- File / folder add -----
     def add_files(self):
@@ -606,14 +1037,19 @@ class MP3Player(ctk.CTk):
         )
         if not paths:
             return
-        seen = set(map(str, self.playlist))
+        seen = self._playlist_index
+        new_paths = []
         for p in paths:
+            if not _has_supported_ext(p):
+                continue
             pp = Path(p)
-            if pp.suffix.lower() in SUPPORTED_EXT and str(pp) not in seen:
-                self.playlist.append(pp)
+            if str(pp) not in seen:
+                new_paths.append(pp)
                 seen.add(str(pp))
+        self.playlist.extend(new_paths)
         self.playlist.sort(key=_natural_key)
-        self._refresh_playlist()
+        self._update_playlist_incremental()
+        self._precompute_durations(new_paths)
 
     def add_folder(self):
         folder = filedialog.askdirectory(title="Add folder")
@@ -622,21 +1058,68 @@ class MP3Player(ctk.CTk):
 
         folder = str(folder)
         base_name = Path(folder).name or "Playlist"
-        files_in = []
-
-        seen = set(map(str, self.playlist))
-        for root, _, files in os.walk(folder):
-            for name in files:
-                pp = Path(root) / name
-                if pp.suffix.lower() in SUPPORTED_EXT:
-                    s = str(pp)
-                    if s not in seen:
-                        self.playlist.append(pp)
-                        files_in.append(s)
-                        seen.add(s)
+        q: queue.Queue = queue.Queue()
 
-        self.playlist.sort(key=_natural_key)
-        self._refresh_playlist()
+        # Walk the tree off the Tk thread; batches are drained by _drain_folder_queue
+        def _worker():
+            batch = []
+            try:
+                for s in _iter_audio(folder):
+                    # Same key as add_files/_load_playlist_paths: askdirectory returns "C:/x",
+                    # so raw entry.path would mix separators on Windows and defeat the dedup
+                    batch.append(str(Path(s)))
+                    if len(batch) >= 256:
+                        q.put(batch)
+                        batch = []
+            finally:
+                if batch:
+                    q.put(batch)
+                q.put(None)
+
+        threading.Thread(target=_worker, daemon=True).start()
+        self.now_label.configure(text=f"Scanning: {truncate(base_name, 50)}...")
+        self.after(50, self._drain_folder_queue, q, [], base_name, self._scan_gen)
+
+    def _drain_folder_queue(self, q: queue.Queue, files_in: list[str], base_name: str, gen: int,
+                            pending: list[Path] | None = None, last_sync: float = 0.0):
+        if gen != self._scan_gen:
+            return  # playlist was cleared/reloaded since the scan started
+
+        done = False
+        added = []
+        pending = [] if pending is None else pending
+        seen = self._playlist_index
+        for _ in range(8):
+            try:
+                batch = q.get_nowait()
+            except queue.Empty:
+                break
+            if batch is None:
+                done = True
+                break
+            # One walk never yields a path twice, so filtering against seen is enough
+            fresh = [s for s in batch if s not in seen]
+            seen.update(fresh)
+            files_in.extend(fresh)
+            added.extend(map(Path, fresh))
+
+        if added:
+            pending.extend(added)
+            self._precompute_durations(added)
+
+        # Sorted inserts shift every later row: merge into the list at most once a second
+        # (and at the end) so a long scan doesn't relabel O(N) rows every tick
+        now = time.monotonic()
+        if pending and (done or now - last_sync >= 1.0):
+            self.playlist.extend(pending)
+            pending.clear()
+            self.playlist.sort(key=_natural_key)
+            self._update_playlist_incremental()
+            last_sync = now
+
+        if not done:
+            self.after(50, self._drain_folder_queue, q, files_in, base_name, gen, pending, last_sync)
+            return
 
         if files_in:
             playlist_name = self._unique_playlist_name(base_name)
@@ -651,30 +1134,41 @@ class MP3Player(ctk.CTk):
     def clear_playlist(self):
         self._halt_playback()
         self.current_index = None
+        self._selected_index = None
+        self._scan_gen += 1
         self.playlist.clear()
-        self._refresh_playlist()
-        self.now_label.configure(text="Playlist cleared")
-        self.time_label.configure(text="00:00 / 00:00")
-        self.progress_var.set(0)
+        self._playlist_index.clear()
+        self._update_playlist_incremental()
+        # Goes through the same queue as _halt_playback so "Stopped" can't land last
+        self._apply_ui_state(progress=0, time_text="00:00 / 00:00", now_text="Playlist cleared")
 
     # ----- Playback -----
     def play_pause(self):
         if self.current_index is None and self.playlist:
             self._start_play(0)
             return
-
-        if pygame.mixer.music.get_busy() and not self.paused:
-            try:
-                cur = max(0, pygame.mixer.music.get_pos())
-            except Exception:
-                cur = 0
-            self.elapsed_base_ms += cur
-            pygame.mixer.music.pause()
-            self.paused = True
+        if self.current_index is None:
+            return  # nothing loaded yet, so the mixer may not be open
+
+        if self._play_state == "PLAYING":
+            self.elapsed_base_ms += int((time.monotonic() - self._play_started_at) * 1000)
+            self._mm.pause()
+            self._play_state = "PAUSED"
+            if not self.track_duration_s:
+                self._set_progress(0)  # unknown duration: empty bar while paused
+                self._indeterminate_set = False
+        elif self._play_state == "PAUSED":
+            self._mm.unpause()
+            self._play_started_at = time.monotonic()
+            self._play_state = "PLAYING"
+            self._resume_polling()
         else:
-            if self.current_index is not None:
-                pygame.mixer.music.unpause()
-                self.paused = False
+            # STOPPED: the mixer holds nothing to unpause (failed auto-advance, halted track)
+            if self._preparing_gen == self._play_gen:
+                return  # this track is still being transcoded; it starts on its own
+            if self.current_index < len(self.playlist):
+                self._start_play(self.current_index)
+            return
 
         self._apply_play_icon()
 
@@ -693,16 +1187,17 @@ class MP3Player(ctk.CTk):
             return random.randrange(n)
 
         next_seq = (self.current_index + 1) % n
-        forbidden = {self.current_index, next_seq}
+        forbidden = (self.current_index, next_seq)
 
-        if n <= len(forbidden):
-            for i in range(n):
-                if i != self.current_index:
-                    return i
-            return None
+        if n <= 2:
+            return next((i for i in range(n) if i != self.current_index), None)
 
-        choices = [i for i in range(n) if i not in forbidden]
-        return random.choice(choices) if choices else None
+        # Rejection sampling: at most 2 of n indices are excluded, so this
+        # takes ≤ 2 draws on average for n ≥ 4 ((n-2)/n acceptance) and never builds a list
+        while True:
+            k = random.randrange(n)
+            if k not in forbidden:
+                return k
 
     def next_track(self):
         if not self.playlist:
@@ -722,12 +1217,48 @@ class MP3Player(ctk.CTk):
         self._apply_shuffle_icon()
 
     def _on_volume(self, val):
+        if not pygame.mixer.get_init():
+            return  # applied from the slider by _ensure_mixer
         try:
-            pygame.mixer.music.set_volume(float(val) / 100)
+            self._mm.set_volume(float(val) / 100)
         except Exception:
             pass
 
     def _read_duration_seconds(self, path: Path) -> float | None:
+        length, parsed = self._cached_duration(path)
+        if parsed:
+            self._dur_dirty = True
+            self._schedule_dur_flush()
+        return length
+
+    def _cached_duration(self, path: Path) -> tuple[float | None, bool]:
+        """(duration, parsed_now). Cache hit if mtime/size match; safe to call from worker threads."""
+        key = str(path)
+        try:
+            st = path.stat()
+        except OSError:
+            st = None
+        if st is not None:
+            ent = self._dur_cache.get(key)
+            if ent and ent[0] == st.st_mtime_ns and ent[1] == st.st_size:
+                return ent[2], False
+
+        length = self._parse_duration_seconds(path)
+        if st is None:
+            return length, False
+        self._dur_cache[key] = (st.st_mtime_ns, st.st_size, length)
+        return length, True
+
+    def _precompute_durations(self, paths: list[Path]):
+        """Warm the duration cache for newly enqueued tracks so _start_play only does a lookup."""
+        if not paths:
+            return
+        if self._dur_pool is None:
+            self._dur_pool = ThreadPoolExecutor(max_workers=2)
+        self._dur_jobs.extend(self._dur_pool.submit(self._cached_duration, p) for p in paths)
+        self._schedule_dur_flush()
+
+    def _parse_duration_seconds(self, path: Path) -> float | None:
         try:
             mf = MutagenFile(str(path))
             if mf is None or not hasattr(mf, "info") or mf.info is None:
@@ -738,127 +1269,443 @@ class MP3Player(ctk.CTk):
             log(f"⚠️ Duration read failed for {path}: {e}")
         return None
 
+    # ----- Duration cache persistence -----
+    def _load_dur_cache(self) -> dict:
+        p = Path(DURATIONS_FILE)
+        if not p.exists():
+            return {}
+        try:
+            data = json.loads(p.read_text(encoding="utf-8"))
+            if isinstance(data, dict):
+                return {k: tuple(v) for k, v in data.items() if isinstance(v, list) and len(v) == 3}
+        except Exception as e:
+            log(f"⚠️ Cannot read {DURATIONS_FILE}: {e}")
+        return {}
+
+    def _schedule_dur_flush(self):
+        # Coalesce bursts of new durations into a single write
+        if self._dur_flush_after is None:
+            self._dur_flush_after = self.after(2000, self._flush_dur_cache)
+
+    def _collect_dur_jobs(self):
+        """Drop finished background reads, noting whether any of them parsed a file."""
+        pending = []
+        for f in self._dur_jobs:
+            if not f.done():
+                pending.append(f)
+            elif not f.cancelled() and f.exception() is None and f.result()[1]:
+                self._dur_dirty = True
+        self._dur_jobs = pending
+
+    def _flush_dur_cache(self):
+        self._dur_flush_after = None
+        self._collect_dur_jobs()
+        if self._dur_jobs:
+            self._schedule_dur_flush()  # background reads still running: write once they're done
+            return
+        if not self._dur_dirty:
+            return  # every track was already cached: nothing new to write
+        self._dur_dirty = False
+        try:
+            # dict() copies in one C call, so a late worker can't resize it mid-dump
+            _write_text_atomic(DURATIONS_FILE, json.dumps(dict(self._dur_cache)))
+        except Exception as e:
+            self._dur_dirty = True  # retried on the next flush / on close
+            log(f"⚠️ Cannot write {DURATIONS_FILE}: {e}")
+
     # ----- M4A fallback via FFmpeg -----
     def _ffmpeg_path(self) -> str | None:
-        return shutil.which("ffmpeg")
+        return _find_ffmpeg()
 
-    def _transcode_to_wav(self, src: Path) -> Path | None:
-        ffmpeg = self._ffmpeg_path()
-        if not ffmpeg:
+    def _transcode_key(self, src: Path) -> str:
+        """Session cache key: path + mtime + size. Just a stat; the WAVs are removed on close anyway."""
+        st = src.stat()
+        return _fast_hash(f"{src}|{st.st_mtime_ns}|{st.st_size}".encode("utf-8"))
+
+    def _transcode_out_path(self, src: Path) -> Path | None:
+        try:
+            h = self._transcode_key(src)
+        except OSError as e:
+            log(f"⚠️ Cannot read {src}: {e}")
             return None
-        h = hashlib.sha1(str(src).encode("utf-8")).hexdigest()[:12]
         tmp_dir = Path(tempfile.gettempdir()) / "mp3player_cache"
         tmp_dir.mkdir(parents=True, exist_ok=True)
-        out = tmp_dir / f"{src.stem}_{h}.wav"
+        return tmp_dir / f"{h}.wav"
+
+    @staticmethod
+    def _part_path(out: Path) -> Path:
+        # Transcode to a side file so an interrupted run never leaves a truncated cache entry
+        return out.with_name(out.stem + ".part.wav")
+
+    def _spawn_transcode(self, src: Path, out: Path) -> subprocess.Popen | None:
+        """Start ffmpeg into out's .part file; non-blocking, so on_close can terminate it."""
+        ffmpeg = self._ffmpeg_path()
+        if not ffmpeg:
+            return None
         try:
-            subprocess.run([ffmpeg, "-y", "-i", str(src), "-ac", "2", "-ar", "44100", "-f", "wav", str(out)],
-                           check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            if out.exists():
-                self._temp_files.append(out)
+            return subprocess.Popen(
+                [ffmpeg, "-y", "-i", str(src), "-ac", "2", "-ar", "44100", "-f", "wav",
+                 str(self._part_path(out))],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError as e:
+            log(f"⚠️ Cannot start ffmpeg: {e}")
+            return None
+
+    @staticmethod
+    def _finish_transcode(proc: subprocess.Popen, out: Path) -> Path | None:
+        """Wait for ffmpeg and publish the WAV. Blocking: runs on a worker, touches no Tk/app state."""
+        part = MP3Player._part_path(out)
+        rc = proc.wait()
+        if rc == 0:
+            try:
+                os.replace(part, out)
                 return out
-        except Exception as e:
-            log(f"⚠️ ffmpeg transcode failed: {e}")
+            except OSError as e:
+                log(f"⚠️ Cannot publish transcoded WAV: {e}")
+        else:
+            log(f"⚠️ ffmpeg transcode failed (exit code {rc})")
+        try:
+            os.unlink(part)
+        except OSError:
+            pass
         return None
 
-    def _ensure_playable_path(self, path: Path) -> Path:
+    def _ensure_playable_path(self, path: Path) -> tuple[Path, bool]:
+        """(path, ready). When not ready, path is the WAV an ffmpeg transcode must produce first."""
         if path.suffix.lower() != ".m4a":
-            return path
+            return path, True
 
         try:
-            pygame.mixer.music.load(str(path))
-            return path  # native support available
+            self._mm.load(str(path))
+            return path, True  # native support available
         except Exception:
             pass
 
-        wav = self._transcode_to_wav(path)
-        if wav:
-            return wav
-        return path
+        out = self._transcode_out_path(path)
+        if out is None:
+            return path, True
+        if out.exists():
+            self._temp_files.add(out)
+            return out, True  # already transcoded this session
+        if not self._ffmpeg_path():
+            return path, True  # let load() fail and report the missing FFmpeg
+        return out, False
+
+    def _start_transcode(self, index: int, src: Path, out: Path):
+        """Transcode src off the Tk thread; _await_transcode starts playback when it's ready."""
+        # Stop the old track so its end event can't auto-advance past the one being prepared
+        self._halt_playback()
+        gen = self._play_gen
+        self._preparing_gen = gen
+        # A repeat request for the same file joins the running ffmpeg instead of racing it
+        # on the same .part file
+        job = self._transcodes.get(out)
+        if job is None:
+            proc = self._spawn_transcode(src, out)
+            if proc is None:
+                self._preparing_gen = None
+                self._deferred_start_play(index, src)  # load() fails and reports the error
+                return
+            if self._transcode_pool is None:
+                self._transcode_pool = ThreadPoolExecutor(max_workers=2)
+            job = (proc, self._transcode_pool.submit(self._finish_transcode, proc, out))
+            self._transcodes[out] = job
+        fut = job[1]
+        self._apply_ui_state(now_text=f"Preparing track: {display_name(src, 50)}...")
+        self.after(100, self._await_transcode, fut, out, index, src, gen)
+
+    def _await_transcode(self, fut, out: Path, index: int, src: Path, gen: int):
+        if not fut.done():
+            self.after(100, self._await_transcode, fut, out, index, src, gen)
+            return
+        job = self._transcodes.get(out)
+        if job is not None and job[1] is fut:
+            del self._transcodes[out]
+        # A crashed worker still completes the future; treat it like a failed transcode
+        wav = None
+        if fut.exception() is not None:
+            log(f"⚠️ ffmpeg transcode failed: {fut.exception()}")
+        else:
+            wav = fut.result()
+        if wav is not None:
+            self._temp_files.add(wav)
+        # Another track was requested, or the playlist changed, while ffmpeg ran
+        if gen != self._play_gen or index >= len(self.playlist) or self.playlist[index] != src:
+            return
+        self._preparing_gen = None
+        self._deferred_start_play(index, wav or src)
+
+    def _deferred_start_play(self, index: int, path_for_play: Path):
+        orig_path = self.playlist[index]
+        try:
+            self._mm.load(str(path_for_play))
+            self._begin_track(index, orig_path)
+        except Exception as e:
+            self._report_play_error(orig_path, e)
 
     def _start_play(self, index: int):
         if not self.playlist:
             return
         orig_path = self.playlist[index]
+        self._play_gen += 1
         try:
-            path_for_play = self._ensure_playable_path(orig_path)
-            pygame.mixer.music.load(str(path_for_play))
-            pygame.mixer.music.play()
-            self.current_index = index
-            self.user_stopped = False
-            self.paused = False
-            self.elapsed_base_ms = 0
-            self._apply_play_icon()
+            self._ensure_mixer()
+            path_for_play, ready = self._ensure_playable_path(orig_path)
+            if not ready:
+                self._start_transcode(index, orig_path, path_for_play)
+                return
+            self._mm.load(str(path_for_play))
+            self._begin_track(index, orig_path)
+        except Exception as e:
+            self._report_play_error(orig_path, e)
+
+    def _begin_track(self, index: int, orig_path: Path):
+        """Start the loaded track and reset the now-playing UI for it."""
+        self._mm.play()
+        if self._use_endevent:
+            # Drop the end event of the track we replaced. pump=False: the event is posted straight
+            # into SDL's queue, and pumping would steal Tk's OS events (notably on macOS)
+            pygame.event.clear(MUSIC_END_EVENT, pump=False)
+        self.current_index = index
+        self._play_state = "PLAYING"
+        self.elapsed_base_ms = 0
+        self._play_started_at = time.monotonic()
+        self._apply_play_icon()
 
-            self.track_duration_s = self._read_duration_seconds(orig_path)
-            self.now_label.configure(text=f"Now playing: {display_name(orig_path, 60)}")
-            self.time_label.configure(text=f"{fmt_time(0)} / {fmt_time(self.track_duration_s) if self.track_duration_s else '00:00'}")
-            self.progress_var.set(0)
+        self.track_duration_s = self._read_duration_seconds(orig_path)
+        self._track_duration_text = fmt_time(self.track_duration_s) if self.track_duration_s else "00:00"
+        self._track_duration_ms_inv = (1.0 / (self.track_duration_s * 1000.0)
+                                       if self.track_duration_s and self.track_duration_s > 0 else 0.0)
+        self.now_label.configure(text=f"Now playing: {display_name(orig_path, 60)}")
+        self._set_time_text(f"{fmt_time(0)} / {self._track_duration_text}")
+        self._last_cur_s = 0
+        self._set_progress(0)
+        self._indeterminate_set = False
+
+        prev = self._current_icon_row_index
+        self._current_icon_row_index = index
+        self._update_current_row_highlight(prev, index)
+        self._on_select(index)
+        self._resume_polling()
+
+    def _report_play_error(self, orig_path: Path, e: Exception):
+        if orig_path.suffix.lower() == ".m4a" and not self._ffmpeg_path():
+            message = ("Unable to play this .m4a.\n\n"
+                       "Install FFmpeg (in PATH) to enable the fallback, "
+                       "or convert the file to .mp3/.wav.")
+        else:
+            message = str(e)
+        messagebox.showerror("Error", f"Cannot play:\n{orig_path}\n\n{message}")
 
-            self._refresh_playlist()
-            self._on_select(index)
+    def _resume_polling(self):
+        """(Re)start the UI tick and end-of-track check; both suspend while nothing is playing."""
+        if self._poll_after is None:
+            self._poll_playback()
+        if self._pump_after is None:
+            self._pump_after = self.after(self._pump_delay(), self._pump_events)
 
-        except Exception as e:
-            if orig_path.suffix.lower() == ".m4a" and not self._ffmpeg_path():
-                message = ("Unable to play this .m4a.\n\n"
-                           "Install FFmpeg (in PATH) to enable the fallback, "
-                           "or convert the file to .mp3/.wav.")
-            else:
-                message = str(e)
-            messagebox.showerror("Error", f"Cannot play:\n{orig_path}\n\n{message}")
+    def _pump_delay(self) -> int:
+        # Draining SDL's queue is cheap; the get_busy() fallback keeps the old 4 Hz cadence
+        return 50 if self._use_endevent else 250
 
     def _poll_playback(self):
-        if self.current_index is not None:
-            try:
-                cur_ms = max(0, pygame.mixer.music.get_pos())
-            except Exception:
-                cur_ms = 0
-            total_ms = self.elapsed_base_ms + (0 if self.paused else cur_ms)
-
-            if self.track_duration_s and self.track_duration_s > 0:
-                dur_ms = self.track_duration_s * 1000.0
-                progress = max(0.0, min(1.0, total_ms / dur_ms))
-                self.progress_var.set(progress)
-                self.time_label.configure(text=f"{fmt_time(total_ms/1000.0)} / {fmt_time(self.track_duration_s)}")
-            else:
-                self.progress_var.set(0 if self.paused else 0.5)
-                self.time_label.configure(text=f"{fmt_time(total_ms/1000.0)} / 00:00")
-
-        if not pygame.mixer.music.get_busy() and not self.paused and not self.user_stopped and self.current_index is not None:
-            self.next_track()
+        # UI refresh only; end-of-track is handled by _pump_events
+        self._poll_after = None
+        if self._play_state != "PLAYING":
+            return  # idle: no tick until _resume_polling() from play/resume
+        if not self._ui_visible:
+            # Minimized: nothing to draw, just keep a slow heartbeat until <Map>
+            self._poll_after = self.after(1000, self._poll_playback)
+            return
 
-        self.after(200, self._poll_playback)
+        # Elapsed time from our own clock: no SDL round-trip per tick
+        total_ms = self.elapsed_base_ms + (time.monotonic() - self._play_started_at) * 1000
+
+        if self._track_duration_ms_inv:
+            # Progress bar resolution is 1/500; compare buckets before touching Tk
+            bucket = min(500, int(total_ms * self._track_duration_ms_inv * 500))
+            if bucket != self._last_progress_bucket:
+                self._last_progress_bucket = bucket
+                self.progress_var.set(bucket / 500)
+        elif not self._indeterminate_set:
+            # Unknown duration: park the bar at half once, not on every tick
+            self._set_progress(0.5)
+            self._indeterminate_set = True
+
+        # The label shows whole seconds: only format when the second changes
+        cur_s = int(total_ms // 1000)
+        if cur_s != self._last_cur_s:
+            self._last_cur_s = cur_s
+            self._set_time_text(f"{fmt_time(cur_s)} / {self._track_duration_text}")
+
+        # The time label is second-precision; 2 Hz is plenty for the progress bar
+        self._poll_after = self.after(500, self._poll_playback)
+
+    def _on_unmap(self, ev):
+        if ev.widget is self:
+            self._ui_visible = False
+
+    def _on_map(self, ev):
+        if ev.widget is not self or self._ui_visible:
+            return
+        self._ui_visible = True
+        # Refresh right away instead of waiting out the slow minimized tick
+        if self._poll_after is not None:
+            self.after_cancel(self._poll_after)
+            self._poll_after = None
+            self._poll_playback()
+
+    # Only cross into Tcl when the displayed value actually changes
+    def _set_progress(self, progress: float):
+        bucket = int(progress * 500)
+        if bucket != self._last_progress_bucket:
+            self._last_progress_bucket = bucket
+            self.progress_var.set(progress)
+
+    def _set_time_text(self, text: str):
+        if text != self._last_time_text:
+            self._last_time_text = text
+            self.time_label.configure(text=text)
+
+    def _pump_events(self):
+        """Advance to the next track when the mixer reports the current one finished."""
+        self._pump_after = None
+        if self._play_state != "PLAYING":
+            return  # nothing can end while paused/stopped; _resume_polling() restarts us
+        if self._use_endevent:
+            # pump=False: only read what SDL already queued, never touch Tk's OS event queue
+            ended = bool(pygame.event.get(MUSIC_END_EVENT, pump=False))
+        else:
+            ended = not self._mm.get_busy()
+        if ended:
+            self._play_state = "STOPPED"
+            if self.current_index is not None:
+                self.next_track()  # a started track reschedules us via _resume_polling()
+            return
+        self._pump_after = self.after(self._pump_delay(), self._pump_events)
 
     # ----- Internal halt (no public Stop button) -----
     def _halt_playback(self):
-        """Internal helper to stop playback & reset UI (used by clear/load)."""
-        try:
-            self.user_stopped = True
-            pygame.mixer.music.stop()
-        except Exception:
-            pass
-        self.paused = False
+        """Stop playback & reset UI (clear/load, and before a background transcode)."""
+        self._play_gen += 1  # a pending transcode must not start playing after this
+        if pygame.mixer.get_init():
+            try:
+                self._mm.stop()
+            except Exception:
+                pass
+        self._play_state = "STOPPED"
         self.elapsed_base_ms = 0
-        self.progress_var.set(0)
-        self._apply_play_icon()
-        self.time_label.configure(text="00:00 / " + (fmt_time(self.track_duration_s) if self.track_duration_s else "00:00"))
-        self.now_label.configure(text="Stopped")
+        self._last_cur_s = -1
+        self._indeterminate_set = False
+        self._apply_ui_state(progress=0, play_icon=True,
+                             time_text="00:00 / " + self._track_duration_text,
+                             now_text="Stopped")
+
+    def _apply_ui_state(self, *, progress: float | None = None, play_icon: bool = False,
+                        time_text: str | None = None, now_text: str | None = None):
+        """Queue now-playing bar updates; they are written together on the next idle pass."""
+        pending = self._pending_ui
+        if progress is not None:
+            pending["progress"] = progress
+        if play_icon:
+            pending["play_icon"] = True
+        if time_text is not None:
+            pending["time_text"] = time_text
+        if now_text is not None:
+            pending["now_text"] = now_text
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.after_idle(self._flush_ui)
+
+    def _flush_ui(self):
+        self._flush_scheduled = False
+        state, self._pending_ui = self._pending_ui, {}
+        if "progress" in state:
+            self._set_progress(state["progress"])
+        if state.get("play_icon"):
+            self._apply_play_icon()
+        if "time_text" in state:
+            self._set_time_text(state["time_text"])
+        if "now_text" in state:
+            self.now_label.configure(text=state["now_text"])
 
     # ----- Clean close -----
+    def _start_persist(self, writes: list[tuple]):
+        """Write on a worker; each writer waits for the previous one so saves land in order."""
+        # Non-daemon: the interpreter waits for it before exiting
+        t = threading.Thread(target=self._persist_state, args=(writes, self._persist_thread),
+                             daemon=False)
+        self._persist_thread = t
+        t.start()
+
+    @staticmethod
+    def _persist_state(writes: list[tuple], prev: threading.Thread | None = None):
+        """writes: (path, text) or (path, text, on_success) tuples."""
+        if prev is not None:
+            prev.join()
+        for path, text, *on_success in writes:
+            try:
+                _write_text_atomic(path, text)
+            except Exception as e:
+                log(f"⚠️ Cannot write {path}: {e}")
+                continue
+            for cb in on_success:
+                cb()
+
     def on_close(self):
-        try:
-            Path(WINDOW_STATE_FILE).write_text(json.dumps({"geo": self.geometry()}), encoding="utf-8")
-        except Exception:
-            pass
-        try:
-            pygame.mixer.music.stop()
-            pygame.mixer.quit()
-        except Exception:
-            pass
-        for p in set(self._temp_files):
+        # Snapshot pending state here; the disk writes happen on a worker so closing isn't blocked
+        writes: list[tuple] = []
+        if self._dur_flush_after is not None:
+            self.after_cancel(self._dur_flush_after)
+            self._collect_dur_jobs()
+            if self._dur_dirty:
+                writes.append((DURATIONS_FILE, json.dumps(dict(self._dur_cache))))
+        if self._dur_pool is not None:
+            self._dur_pool.shutdown(wait=False, cancel_futures=True)
+        # Kill running ffmpeg jobs: their waiter threads would otherwise keep the process alive
+        for out, (proc, fut) in list(self._transcodes.items()):
+            if proc.poll() is None:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=2)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+            if not fut.cancel():  # queued waiters just drop; a running one finishes its rename/unlink
+                try:
+                    fut.result(timeout=1)
+                except Exception:
+                    pass
+            self._temp_files.update((out, self._part_path(out)))  # whichever of them exists
+        self._transcodes.clear()
+        if self._transcode_pool is not None:
+            self._transcode_pool.shutdown(wait=False, cancel_futures=True)
+        if self._pl_save_after is not None:
+            self.after_cancel(self._pl_save_after)
+            snap = self._playlists_snapshot()
+            if snap is not None:
+                writes.append((PLAYLISTS_FILE, snap[0]))
+        if self._geo_save_after is not None:
+            self.after_cancel(self._geo_save_after)
+        geo = self.geometry()
+        if geo != self._last_saved_geo:
+            writes.append((WINDOW_STATE_FILE, json.dumps({"geo": geo})))
+        if writes:
+            self._start_persist(writes)
+
+        if pygame.mixer.get_init():
             try:
-                p.unlink(missing_ok=True)
+                self._mm.stop()
+                pygame.mixer.quit()
             except Exception:
                 pass
+        def _unlink(p: Path):
+            try:
+                os.unlink(p)
+            except OSError:
+                pass
+        # Overlap the unlinks so shutdown doesn't scale with N × unlink latency
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            ex.map(_unlink, self._temp_files)
         self.destroy()
 
 
@@ -0,0 +1,30 @@
+# cython: boundscheck=False, wraparound=False, language_level=3
+"""Optional compiled natural-sort key for mp3_player.
+
+Build in place with:  cythonize -i natkey.pyx
+mp3_player falls back to its pure-Python key when this module is absent.
+"""
+
+
+cpdef list natural_key(str s):
+    # Same shape as re.split(r'(\d+)', s): text, number, text, ..., text
+    cdef list out = []
+    cdef Py_ssize_t i, start = 0, n = len(s)
+    cdef bint in_digits = False
+    cdef bint d
+    for i in range(n):
+        d = s[i].isdecimal()
+        if d and not in_digits:
+            out.append(s[start:i].lower())
+            start = i
+            in_digits = True
+        elif not d and in_digits:
+            out.append(int(s[start:i]))
+            start = i
+            in_digits = False
+    if in_digits:
+        out.append(int(s[start:]))
+        out.append("")
+    else:
+        out.append(s[start:].lower())
+    return out